@@ -6,4 +6,4 @@ class PngChunk:
         self.crc = crc
 
     def __str__(self):
-        return f"Chunk {self.type} ({self.length} bytes)"
+        return f"Chunk {self.type.decode('ascii')} ({self.length} bytes)"
@@ -8,7 +8,7 @@ IV = os.urandom(245)
 
 # Computes CRC for a given PNG chunk type and data
 def compute_crc(chunk_type, data):
-    check_bytes = chunk_type.encode('ascii') + data
+    check_bytes = chunk_type + data
     crc = zlib.crc32(check_bytes) & 0xffffffff
     return crc
 
@@ -19,7 +19,7 @@ def xor_bytes(a, b):
 # Encrypts a single PNG chunk
 def encrypt_chunk_cbc(chunk: PngChunk, public_key, iv: bytes) -> PngChunk:
     # Encrypt only IDAT chunks
-    if chunk.type != 'IDAT':
+    if chunk.type != b'IDAT':
         return chunk
 
     # Determine block size from RSA modulus
@@ -55,7 +55,7 @@ def encrypt_chunk_cbc(chunk: PngChunk, public_key, iv: bytes) -> PngChunk:
 # Decrypts a single PNG chunk
 def decrypt_chunk_cbc(chunk: PngChunk, private_key, iv: bytes) -> PngChunk:
     # Decrypt only IDAT chunks
-    if chunk.type != 'IDAT':
+    if chunk.type != b'IDAT':
         return chunk
 
     n_bits = private_key[1].bit_length()
@@ -66,7 +66,7 @@ def decrypt_chunk_cbc(chunk: PngChunk, private_key, iv: bytes) -> PngChunk:
     data = zlib.decompress(chunk.data)
 
     if len(data) % block_size != 0:
-        raise ValueError(f"Chunk {chunk.type} has invalid encrypted length")
+        raise ValueError(f"Chunk {chunk.type.decode('ascii')} has invalid encrypted length")
 
     decrypted_data = bytearray()
     prev_block = iv
@@ -5,12 +5,12 @@ import png_parser
 
 # Computes the CRC checksum for a given PNG chunk
 def compute_crc(chunk_type, data):
-    check_bytes = chunk_type.encode('ascii') + data
+    check_bytes = chunk_type + data
     crc = zlib.crc32(check_bytes) & 0xFFFFFFFF
     return crc
 
 def encrypt_chunk_ecb(chunk, public_key):
-    if chunk.type != "IDAT":
+    if chunk.type != b"IDAT":
         return chunk
     
     # Determine RSA key block size
@@ -36,7 +36,7 @@ def encrypt_chunk_ecb(chunk, public_key):
     return PngChunk(len(encrypted_chunk_data), chunk.type, encrypted_chunk_data, new_crc)
 
 def decrypt_chunk_ecb(chunk, private_key):
-    if chunk.type != "IDAT":
+    if chunk.type != b"IDAT":
         return chunk
     
     n_bits = private_key[1].bit_length()
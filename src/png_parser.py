@@ -3,12 +3,20 @@ import struct
 import zlib
 import piexif
 import numpy as np
+from numba import njit, prange
 from collections import Counter
 
 
 # PNG file signature (magic number)
 PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
 
+# Precompiled binary layouts of chunk fields
+_U32 = struct.Struct(">I")
+_HDR = struct.Struct(">I4s")
+_IHDR = struct.Struct(">IIBBBBB")
+_TIME = struct.Struct(">HBBBBB")
+_PHYS = struct.Struct(">IIB")
+
 def read_chunks(file_path):
     chunks = []
 
@@ -18,64 +26,51 @@ def read_chunks(file_path):
             raise ValueError("Not a valid PNG file.")
 
         while True:
-            length_bytes = f.read(4)
-            if len(length_bytes) == 0:
+            header = f.read(_HDR.size)
+            if len(header) < _HDR.size:
                 break
 
-            length = struct.unpack(">I", length_bytes)[0]
-            chunk_type = f.read(4).decode("ascii")
-            data = f.read(length)
-            crc = struct.unpack(">I", f.read(4))[0]
+            length, chunk_type = _HDR.unpack(header)
+            # Chunk data is followed by its CRC, read both at once
+            body = f.read(length + 4)
+            data = body[:length]
+            crc = _U32.unpack_from(body, length)[0]
+
+            # CRC covers chunk type and data, chained to avoid concatenating them
+            if zlib.crc32(data, zlib.crc32(chunk_type)) != crc:
+                raise ValueError(f"CRC mismatch in {chunk_type.decode('ascii')} chunk")
 
             chunk = PngChunk(length, chunk_type, data, crc)
             chunks.append(chunk)
 
-            if chunk_type == "IEND":
+            if chunk_type == b"IEND":
                 break
 
     return chunks
 
 def extract_metadata(chunks):
     ihdr_data = None
-    idat_data = b""
 
     for chunk in chunks:
-        if chunk.type == "IHDR":
-            ihdr_data = parse_IHDR(chunk)
-            print("IHDR metadata: " + str(ihdr_data))
-
-        elif chunk.type == "tEXt":
-            print("tEXt metadata: " + str(parse_tEXt(chunk)))
-
-        elif chunk.type == "iTXt":
-            print("iTXt metadata: " + str(parse_iTXt(chunk)))
-        
-        elif chunk.type == "tIME":
-            print("tIME metadata: " + str(parse_tIME(chunk)))
-
-        elif chunk.type == "eXIf":
-            print("eXIf metadata: " + str(parse_eXIf(chunk)))
-        
-        elif chunk.type == "pHYs":
-            print("pHYs metadata: " + str(parse_pHYs(chunk)))
-
-        elif chunk.type == "zTXt":
-            print("zTXt metadata: " + str(parse_zTXt(chunk)))
-        
-        elif chunk.type == "IDAT":
-            idat_data += chunk.data
-
-        elif chunk.type == "PLTE":
+        parser = _PARSERS.get(chunk.type)
+        if parser is not None:
+            metadata = parser(chunk)
+            print(f"{chunk.type.decode('ascii')} metadata: " + str(metadata))
+            if chunk.type == b"IHDR":
+                ihdr_data = metadata
+
+        # PLTE depends on the color type from IHDR
+        elif chunk.type == b"PLTE":
             color_type = ihdr_data["color_type"]
             print("PLTE metadata: " + str(parse_PLTE(chunk, color_type)))
 
 
 # Parses the IHDR chunk which contains basic image information
 def parse_IHDR(chunk):
-    if(chunk.type != "IHDR"):
+    if(chunk.type != b"IHDR"):
         raise ValueError("Chunk is not type of IHDR")
 
-    fields = struct.unpack(">IIBBBBB", chunk.data)
+    fields = _IHDR.unpack(chunk.data)
     ihdr_info = {
         "width": fields[0],
         "height": fields[1],
@@ -90,7 +85,7 @@ def parse_IHDR(chunk):
 
 # Parses a tEXt chunk (keyword + plain text)
 def parse_tEXt(chunk):
-    if(chunk.type != "tEXt"):
+    if(chunk.type != b"tEXt"):
         raise ValueError("Chunk is not type of tEXt")
 
     null_pos = chunk.data.find(b'\x00')
@@ -101,7 +96,7 @@ def parse_tEXt(chunk):
 
 # Parses an iTXt chunk (international text with optional compression and translation)
 def parse_iTXt(chunk):
-    if(chunk.type != "iTXt"):
+    if(chunk.type != b"iTXt"):
         raise ValueError("Chunk is not type of iTXt")
 
     parts = chunk.data.split(b'\x00', 5)
@@ -130,10 +125,10 @@ def parse_iTXt(chunk):
 
 # Parses tIME chunk (last modification time)
 def parse_tIME(chunk):
-    if(chunk.type != "tIME"):
+    if(chunk.type != b"tIME"):
         raise ValueError("Chunk is not type of tIME")
 
-    year, month, day, hour, minute, second = struct.unpack(">HBBBBB", chunk.data)
+    year, month, day, hour, minute, second = _TIME.unpack(chunk.data)
 
     return {
         "year": year,
@@ -146,18 +141,17 @@ def parse_tIME(chunk):
 
 # Parses EXIF metadata from eXIf chunk using piexif
 def parse_eXIf(chunk):
-    if chunk.type != "eXIf":
+    if chunk.type != b"eXIf":
         raise ValueError("Chunk is not type of eXIf")
     
     try:
         exif_dict = piexif.load(chunk.data)
-        readable_exif = {}
-
-        for ifd in exif_dict:
-            if isinstance(exif_dict[ifd], dict):
-                for tag in exif_dict[ifd]:
-                    tag_name = piexif.TAGS[ifd][tag]["name"]
-                    readable_exif[tag_name] = exif_dict[ifd][tag]
+        readable_exif = {
+            piexif.TAGS[ifd][tag]["name"]: value
+            for ifd, ifd_dict in exif_dict.items()
+            if isinstance(ifd_dict, dict)
+            for tag, value in ifd_dict.items()
+        }
 
         return readable_exif
 
@@ -167,7 +161,7 @@ def parse_eXIf(chunk):
 
 # Parses zTXt chunk (compressed text)
 def parse_zTXt(chunk):
-    if(chunk.type != "zTXt"):
+    if(chunk.type != b"zTXt"):
         raise ValueError("Chunk is not type of zTXt")
 
     null_pos = chunk.data.find(b'\x00')
@@ -184,10 +178,10 @@ def parse_zTXt(chunk):
 
 # Parses pHYs chunk (physical pixel dimensions)
 def parse_pHYs(chunk):
-    if(chunk.type != "pHYs"):
+    if(chunk.type != b"pHYs"):
         raise ValueError("Chunk is not type of pHYs")
     
-    pixels_per_unit_X, pixels_per_unit_Y, unit_sepecifier = struct.unpack(">IIB", chunk.data)
+    pixels_per_unit_X, pixels_per_unit_Y, unit_sepecifier = _PHYS.unpack(chunk.data)
 
     unit = "meter" if unit_sepecifier == 1 else "unknown"   
 
@@ -199,7 +193,7 @@ def parse_pHYs(chunk):
 
 # Parses PLTE chunk (color palette)
 def parse_PLTE(chunk, color_type):
-    if chunk.type != "PLTE":
+    if chunk.type != b"PLTE":
         raise ValueError("Chunk is not type of PLTE")
 
     if color_type == 0 or color_type == 4:
@@ -209,18 +203,25 @@ def parse_PLTE(chunk, color_type):
     if len(data) % 3 != 0:
         raise ValueError("PLTE chunk length is not divisible by 3.")
 
-    palette = []
-    for i in range(0, len(data), 3):
-        r = data[i]
-        g = data[i+1]
-        b = data[i+2]
-        palette.append((r, g, b))
+    # View palette as (colors, 3) array, tuples are built in C by tolist()
+    palette_arr = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
 
     return {
-        "colors_count": len(palette),
-        "colors": palette
+        "colors_count": palette_arr.shape[0],
+        "colors": list(map(tuple, palette_arr.tolist()))
     }
 
+# Parsers of chunks that are handled independently, keyed by chunk type
+_PARSERS = {
+    b"IHDR": parse_IHDR,
+    b"tEXt": parse_tEXt,
+    b"iTXt": parse_iTXt,
+    b"tIME": parse_tIME,
+    b"eXIf": parse_eXIf,
+    b"pHYs": parse_pHYs,
+    b"zTXt": parse_zTXt
+}
+
 def get_dominant_colors(arr, color_type, top_n=5):
     # For palette images, count palette indices
     if color_type == 3:
@@ -228,20 +229,29 @@ def get_dominant_colors(arr, color_type, top_n=5):
         return {f"Palette index {k}": v for k, v in Counter(flat).most_common(top_n)}
     # For RGB/RGBA, count RGB triples
     elif color_type in (2, 6):
-        pixels = arr.reshape(-1, arr.shape[-1])[:, :3]
-        pixels = [(int(p[0]), int(p[1]), int(p[2])) for p in pixels]
-        color_counts = Counter(pixels)
-        return {f"RGB{color}": count for color, count in color_counts.most_common(top_n)}
+        # Pack each RGB triple into one integer so counting runs in C
+        shift = arr.dtype.itemsize * 8
+        pixels = arr.reshape(-1, arr.shape[-1])[:, :3].astype(np.uint64 if shift > 8 else np.uint32)
+        packed = (pixels[:, 0] << (2 * shift)) | (pixels[:, 1] << shift) | pixels[:, 2]
+        colors, first_index, counts = np.unique(packed, return_index=True, return_counts=True)
+
+        # Most frequent first, ties broken by first occurrence like Counter.most_common
+        top = np.lexsort((first_index, -counts))[:top_n]
+
+        mask = (1 << shift) - 1
+        dominant = {}
+        for color, count in zip(colors[top].tolist(), counts[top].tolist()):
+            rgb = (color >> (2 * shift), (color >> shift) & mask, color & mask)
+            dominant[f"RGB{rgb}"] = count
+        return dominant
     return None
 
-def get_compression_info(idat_data):
+def get_compression_info(compressed_size, decompressed_size):
     # Compare compressed and decompressed sizes
-    original_size = len(idat_data)
-    decompressed = zlib.decompress(idat_data)
-    ratio = original_size / len(decompressed)
+    ratio = compressed_size / decompressed_size
     return {
-        "compressed_size": original_size,
-        "uncompressed_size": len(decompressed),
+        "compressed_size": compressed_size,
+        "uncompressed_size": decompressed_size,
         "compression_ratio": round(ratio, 2)
     }
 
@@ -250,30 +260,29 @@ def has_transparency(arr, color_type):
     if color_type not in (4, 6):
         return False
     alpha_channel = arr[..., -1] if color_type == 6 else arr[..., 1]
-    if np.any(alpha_channel < 255):
-        return True
-    return False
+    # Single min reduction, no intermediate boolean mask
+    return bool(alpha_channel.min() < 255)
 
 def get_image_stats(arr, color_type):
+    # Per-channel min/max in a single reduction, global min/max are taken from them
+    channels = arr.shape[-1] if arr.ndim == 3 else 1
+    flat = arr.reshape(-1, channels)
+    mins = flat.min(axis=0)
+    maxs = flat.max(axis=0)
+
     stats = {
-        "min_value": float(np.min(arr)),
-        "max_value": float(np.max(arr)),
-        "mean_value": float(np.mean(arr)),
-        "std_dev": float(np.std(arr)),
+        "min_value": float(mins.min()),
+        "max_value": float(maxs.max()),
+        "mean_value": float(flat.mean()),
+        "std_dev": float(flat.std()),
         "unique_values": len(np.unique(arr)) if color_type == 3 else None
     }
     
     if color_type in (2, 6):  # RGB/RGBA
         stats["channel_stats"] = {
-            "R": {"min": float(np.min(arr[..., 0])), "max": float(np.max(arr[..., 0]))},
-            "G": {"min": float(np.min(arr[..., 1])), "max": float(np.max(arr[..., 1]))},
-            "B": {"min": float(np.min(arr[..., 2])), "max": float(np.max(arr[..., 2]))}
+            name: {"min": float(mins[i]), "max": float(maxs[i])}
+            for i, name in enumerate("RGBA"[:channels])
         }
-        if color_type == 6:  # RGBA
-            stats["channel_stats"]["A"] = {
-                "min": float(np.min(arr[..., 3])),
-                "max": float(np.max(arr[..., 3]))
-            }
     
     return stats
 
@@ -290,28 +299,9 @@ def parse_IDAT(idat_data, width, height, bit_depth, color_type):
     bits_per_scanline = width * channels * bit_depth
     bytes_per_scanline = (bits_per_scanline + 7) // 8
 
-    pixels = []
-    prev_scanline = None
-    offset = 0
-    
-    # Iterate over all scanlines
-    for _ in range(height):
-        if offset + 1 + bytes_per_scanline > len(decompressed):
-            raise ValueError("Unexpected end of IDAT data")
-
-        filter_type = decompressed[offset]
-        offset += 1
-        
-        scanline = decompressed[offset:offset + bytes_per_scanline]
-        offset += bytes_per_scanline
-
-        # Reconstruct unfiltered scanline
-        unfiltered = undo_filter(filter_type, scanline, prev_scanline, (channels * bit_depth + 7) // 8)
-        pixels.append(unfiltered)
-        prev_scanline = unfiltered
-
-    # Merge all scanlines into single byte buffer
-    pixel_data = b''.join(pixels)
+    # Unfiltered scanlines are written straight into one preallocated buffer
+    pixel_data = np.empty((height, bytes_per_scanline), dtype=np.uint8)
+    unfilter_scanlines(decompressed, pixel_data, (channels * bit_depth + 7) // 8)
 
     # Determine correct NumPy dtype
     if bit_depth == 8:
@@ -336,7 +326,7 @@ def parse_IDAT(idat_data, width, height, bit_depth, color_type):
     metadata = {
         "stats": get_image_stats(arr, color_type),
         "dominant_colors": get_dominant_colors(arr, color_type),
-        "compression": get_compression_info(idat_data),
+        "compression": get_compression_info(len(idat_data), len(decompressed)),
         "raw_shape": f"{height}x{width}x{channels}",
         "has_transparency": has_transparency(arr, color_type)
     }
@@ -348,98 +338,169 @@ def write_chunks(filename, chunks):
         f.write(PNG_SIGNATURE)
 
         for chunk in chunks:
-            f.write(chunk.length.to_bytes(4, "big"))
-            f.write(chunk.type.encode("ascii"))
+            f.write(_U32.pack(chunk.length))
+            f.write(chunk.type)
             f.write(chunk.data)
-            f.write(chunk.crc.to_bytes(4, "big"))
+            f.write(_U32.pack(chunk.crc))
+
+# Number of channels indexed by color type, -1 marks undefined color types
+_CHANNELS = (
+    1,   # 0: Grayscale
+    -1,
+    3,   # 2: RGB
+    1,   # 3: Indexed
+    2,   # 4: Grayscale + Alpha
+    -1,
+    4    # 6: RGBA
+)
 
 def get_channels_from_color_type(color_type):
-    if color_type == 0:  # Grayscale
-        channels = 1
-    elif color_type == 2:  # RGB
-        channels = 3
-    elif color_type == 3:  # Indexed
-        channels = 1
-    elif color_type == 4:  # Grayscale + Alpha
-        channels = 2
-    elif color_type == 6:  # RGBA
-        channels = 4
-    else:
+    channels = _CHANNELS[color_type] if 0 <= color_type < len(_CHANNELS) else -1
+    if channels < 0:
         raise ValueError(f"Unsupported color type: {color_type}")
 
     return channels
 
 # Paeth predictor algorithm used in PNG filter type 4
+# Works element-wise on signed integer arrays, so whole pixels (or rows) are predicted at once
 def paeth_predictor(a, b, c):
     p = a + b - c
-    pa = abs(p - a)
-    pb = abs(p - b)
-    pc = abs(p - c)
-    if pa <= pb and pa <= pc:
-        return a
-    elif pb <= pc:
-        return b
-    else:
-        return c
-
-def undo_filter(filter_type, scanline, prev_scanline, bytes_per_pixel):
-    result = bytearray(len(scanline))
-    if filter_type == 0:  # None
-        return scanline
+    pa = np.abs(p - a)
+    pb = np.abs(p - b)
+    pc = np.abs(p - c)
+    return np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+
+# Reconstructs a filtered scanline into out, all scanlines are np.uint8 arrays
+def undo_filter(filter_type, scanline, prev_scanline, out, bytes_per_pixel):
+    if filter_type == 0 or (filter_type == 2 and prev_scanline is None):  # None, or Up on the first row
+        out[:] = scanline
     elif filter_type == 1:  # Sub
-        for i in range(len(scanline)):
-            left = result[i - bytes_per_pixel] if i >= bytes_per_pixel else 0
-            result[i] = (scanline[i] + left) & 0xFF
+        # Running sum over pixels, uint8 arithmetic wraps modulo 256
+        pixels = scanline.reshape(-1, bytes_per_pixel)
+        np.add.accumulate(pixels, axis=0, dtype=np.uint8, out=out.reshape(-1, bytes_per_pixel))
     elif filter_type == 2:  # Up
-        for i in range(len(scanline)):
-            up = prev_scanline[i] if prev_scanline else 0
-            result[i] = (scanline[i] + up) & 0xFF
-    elif filter_type == 3:  # Average
-        for i in range(len(scanline)):
-            left = result[i - bytes_per_pixel] if i >= bytes_per_pixel else 0
-            up = prev_scanline[i] if prev_scanline else 0
-            result[i] = (scanline[i] + ((left + up) // 2)) & 0xFF
-    elif filter_type == 4:  # Paeth
-        for i in range(len(scanline)):
-            left = result[i - bytes_per_pixel] if i >= bytes_per_pixel else 0
-            up = prev_scanline[i] if prev_scanline else 0
-            up_left = prev_scanline[i - bytes_per_pixel] if (prev_scanline and i >= bytes_per_pixel) else 0
-            result[i] = (scanline[i] + paeth_predictor(left, up, up_left)) & 0xFF
+        np.add(scanline, prev_scanline, out=out)
+    elif filter_type == 3 or filter_type == 4:  # Average / Paeth
+        undo_filter_jit(filter_type, scanline, prev_scanline, out, bytes_per_pixel)
     else:
         raise ValueError(f"Unknown filter type {filter_type}")
-    return result
 
+# Compiled reconstruction of Average and Paeth filters,
+# which depend on the reconstructed left byte and can't be vectorized
+@njit(cache=True, boundscheck=False)
+def undo_filter_jit(filter_type, scanline, prev_scanline, out, bytes_per_pixel):
+    for i in range(len(scanline)):
+        left = np.int64(out[i - bytes_per_pixel]) if i >= bytes_per_pixel else 0
+        up = 0
+        up_left = 0
+        if prev_scanline is not None:
+            up = np.int64(prev_scanline[i])
+            if i >= bytes_per_pixel:
+                up_left = np.int64(prev_scanline[i - bytes_per_pixel])
+
+        if filter_type == 3:  # Average
+            predictor = (left + up) >> 1
+        else:  # Paeth, inlined
+            # Distances from p = left + up - up_left, written so LLVM lowers them to abs/min/cmov
+            pa = abs(up - up_left)
+            pb = abs(left - up_left)
+            pc = abs(left + up - 2 * up_left)
+            mn = min(pa, pb, pc)
+            predictor = left if pa == mn else (up if pb == mn else up_left)
+
+        out[i] = (scanline[i] + predictor) & 0xFF
+
+# Columns handled by one thread in undo_up_run_jit
+_UP_RUN_BLOCK = 4096
+
+# Compiled reconstruction of a run of None/Up rows, rows include their filter byte.
+# Columns don't depend on each other, so contiguous blocks of them are split across
+# threads and each block is walked row by row to keep memory access sequential
+@njit(parallel=True, cache=True, boundscheck=False)
+def undo_up_run_jit(rows, prev_scanline, out):
+    height, width = out.shape
+    blocks = (width + _UP_RUN_BLOCK - 1) // _UP_RUN_BLOCK
+    for block in prange(blocks):
+        start = block * _UP_RUN_BLOCK
+        end = min(start + _UP_RUN_BLOCK, width)
+        for y in range(height):
+            # 1-D views of the block let LLVM vectorize the inner loops
+            scanline = rows[y, start + 1:end + 1]
+            unfiltered = out[y, start:end]
+            if rows[y, 0] == 0:  # None
+                for i in range(end - start):
+                    unfiltered[i] = scanline[i]
+            elif y > 0:  # Up
+                up = out[y - 1, start:end]
+                for i in range(end - start):
+                    unfiltered[i] = scanline[i] + up[i]
+            elif prev_scanline is None:  # Up on the first row of the image
+                for i in range(end - start):
+                    unfiltered[i] = scanline[i]
+            else:  # Up from the row before the run
+                up = prev_scanline[start:end]
+                for i in range(end - start):
+                    unfiltered[i] = scanline[i] + up[i]
+
+# Reconstructs filtered data (filter byte + scanline per row) into out,
+# a preallocated (height, bytes_per_scanline) np.uint8 array
+def unfilter_scanlines(data, out, bytes_per_pixel):
+    height, bytes_per_scanline = out.shape
+    row_size = 1 + bytes_per_scanline
+
+    if len(data) < height * row_size:
+        raise ValueError("Unexpected end of IDAT data")
+
+    # View data as rows of filter byte + scanline
+    rows = np.frombuffer(data, dtype=np.uint8, count=height * row_size)
+    rows = rows.reshape((height, row_size))
+
+    # Filter bytes read through a memoryview come out as plain ints, without copying
+    filter_types = memoryview(data)[:height * row_size:row_size]
+
+    prev_scanline = None
+    y = 0
+    while y < height:
+        # None/Up rows don't depend on their left neighbour, reconstruct runs of them in parallel
+        end = y
+        while end < height and filter_types[end] in (0, 2):
+            end += 1
+
+        if end - y > 1:
+            undo_up_run_jit(rows[y:end], prev_scanline, out[y:end])
+        else:
+            end = y + 1
+            undo_filter(filter_types[y], rows[y, 1:], prev_scanline, out[y], bytes_per_pixel)
+
+        prev_scanline = out[end - 1]
+        y = end
+
+# Filters a scanline, both scanlines are np.uint8 arrays
+# Also accepts (rows, bytes) arrays to filter several scanlines at once
 def apply_filter(filter_type, scanline, prev_scanline, bytes_per_pixel):
-    result = bytearray(len(scanline))
-    
     if filter_type == 0:  # None
         return scanline
-    elif filter_type == 1:  # Sub
-        for i in range(len(scanline)):
-            left = scanline[i - bytes_per_pixel] if i >= bytes_per_pixel else 0
-            result[i] = (scanline[i] - left) & 0xFF
+
+    # Filters only read the original bytes, so neighbours can be shifted in as whole rows
+    left = np.zeros_like(scanline)
+    left[..., bytes_per_pixel:] = scanline[..., :-bytes_per_pixel]
+    up = prev_scanline if prev_scanline is not None else np.zeros_like(scanline)
+
+    if filter_type == 1:  # Sub
+        return scanline - left
     elif filter_type == 2:  # Up
-        for i in range(len(scanline)):
-            up = prev_scanline[i] if prev_scanline else 0
-            result[i] = (scanline[i] - up) & 0xFF
+        return scanline - up
     elif filter_type == 3:  # Average
-        for i in range(len(scanline)):
-            left = scanline[i - bytes_per_pixel] if i >= bytes_per_pixel else 0
-            up = prev_scanline[i] if prev_scanline else 0
-            average = (left + up) // 2
-            result[i] = (scanline[i] - average) & 0xFF
+        average = (left.astype(np.uint16) + up) >> 1
+        return scanline - average.astype(np.uint8)
     elif filter_type == 4:  # Paeth
-        for i in range(len(scanline)):
-            left = scanline[i - bytes_per_pixel] if i >= bytes_per_pixel else 0
-            up = prev_scanline[i] if prev_scanline else 0
-            up_left = prev_scanline[i - bytes_per_pixel] if (prev_scanline and i >= bytes_per_pixel) else 0
-            paeth = paeth_predictor(left, up, up_left)
-            result[i] = (scanline[i] - paeth) & 0xFF
+        up_left = np.zeros_like(up)
+        up_left[..., bytes_per_pixel:] = up[..., :-bytes_per_pixel]
+        paeth = paeth_predictor(left.astype(np.int16), up.astype(np.int16), up_left.astype(np.int16))
+        return scanline - paeth.astype(np.uint8)
     else:
         raise ValueError(f"Unknown filter type {filter_type}")
 
-    return result
-
 def get_bytes_per_scanline(width, color_type, bit_depth):
     channels = get_channels_from_color_type(color_type)
     return (width * channels * bit_depth + 7) // 8
@@ -457,21 +518,22 @@ def apply_png_filters(pixel_data, image_info, filter_type=0):
     bytes_per_pixel = get_bytes_per_pixel(color_type, bit_depth)
     bytes_per_scanline = get_bytes_per_scanline(width, color_type, bit_depth)
 
-    filtered_data = bytearray()
-    prev_scanline = None
-
-    for y in range(height):
-        start = y * bytes_per_scanline
-        end = start + bytes_per_scanline
-        scanline = pixel_data[start:end]
+    scanlines = np.frombuffer(pixel_data, dtype=np.uint8, count=height * bytes_per_scanline)
+    scanlines = scanlines.reshape((height, bytes_per_scanline))
 
-        filtered_scanline = apply_filter(filter_type, scanline, prev_scanline, bytes_per_pixel)
+    filtered_data = np.empty((height, 1 + bytes_per_scanline), dtype=np.uint8)
 
-        filtered_data.append(filter_type)
-        filtered_data.extend(filtered_scanline)
-        prev_scanline = scanline
+    if filter_type == 0:  # None, scanlines are copied unchanged
+        filtered_data[:, 1:] = scanlines
+    else:
+        # Filters only read original bytes, so all scanlines are filtered at once
+        # against the rows above them (zeros above the first one)
+        prev_scanlines = np.zeros_like(scanlines)
+        prev_scanlines[1:] = scanlines[:-1]
+        filtered_data[:, 1:] = apply_filter(filter_type, scanlines, prev_scanlines, bytes_per_pixel)
 
-    return bytes(filtered_data)
+    filtered_data[:, 0] = filter_type
+    return filtered_data.tobytes()
 
 def remove_png_filters(data, image_info):
     width = image_info['width']
@@ -482,22 +544,9 @@ def remove_png_filters(data, image_info):
     bytes_per_pixel = get_bytes_per_pixel(color_type, bit_depth)
     bytes_per_scanline = get_bytes_per_scanline(width, color_type, bit_depth)
 
-    pixels = []
-    prev_scanline = None
-    offset = 0
-
-    for _ in range(height):
-        if offset + 1 + bytes_per_scanline > len(data):
-            raise ValueError("Unexpected end of IDAT data")
-
-        filter_type = data[offset]
-        offset += 1
-
-        scanline = data[offset:offset + bytes_per_scanline]
-        offset += bytes_per_scanline
-
-        unfiltered = undo_filter(filter_type, scanline, prev_scanline, bytes_per_pixel)
-        pixels.append(unfiltered)
-        prev_scanline = unfiltered
+    # Scanlines are reconstructed in place into the returned bytearray
+    out = bytearray(height * bytes_per_scanline)
+    pixels = np.frombuffer(out, dtype=np.uint8).reshape((height, bytes_per_scanline))
+    unfilter_scanlines(data, pixels, bytes_per_pixel)
 
-    return b''.join(pixels)
\ No newline at end of file
+    return out
\ No newline at end of file
@@ -7,14 +7,14 @@ import png_parser
 
 # Computes CRC for a given PNG chunk type and data
 def compute_crc(chunk_type, data):
-    check_bytes = chunk_type.encode('ascii') + data
+    check_bytes = chunk_type + data
     crc = zlib.crc32(check_bytes) & 0xFFFFFFFF
     return crc
 
 # Encrypt a single PNG chunk using RSA PKCS#1 v1.5 encryption
 def encrypt_chunk_rsa_lib(chunk: PngChunk, public_key) -> PngChunk:
     # Encrypt only IDAT chunks
-    if chunk.type != 'IDAT':
+    if chunk.type != b'IDAT':
         return chunk
 
     e, n = public_key
@@ -39,7 +39,7 @@ def encrypt_chunk_rsa_lib(chunk: PngChunk, public_key) -> PngChunk:
 # Decrypts a single PNG chunk using the RSA PKCS#1 v1.5 decryption mode
 def decrypt_chunk_rsa_lib(chunk: PngChunk, private_key) -> PngChunk:
     # Decrypt only IDAT  chunks
-    if chunk.type != 'IDAT':
+    if chunk.type != b'IDAT':
         return chunk
 
     d, n = private_key